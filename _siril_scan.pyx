@@ -0,0 +1,150 @@
+# cython: language_level=3
+"""
+Optional Cython-compiled scan loop for siril_log_analyzer.
+
+When Cython is installed, siril_log_analyzer imports scan_lines() from
+this module (built on the fly via pyximport) and uses it in place of the
+pure-Python loop. The dispatch below mirrors
+SirilLogParser._scan_lines — keep the two in sync when adding handlers.
+
+The win over the Python loop is that the per-line interpreter dispatch
+and the hot counters (solve counts, FWHM/rotation aggregates) run as C
+locals, with parser state written back once at the end of the scan.
+
+License: GPL-3.0-or-later (matching parent project)
+"""
+
+
+def scan_lines(parser, lines):
+    """Scan an iterable of bytes log lines, updating parser state"""
+    # Imported at call time: this module is itself imported while
+    # siril_log_analyzer is still executing
+    from siril_log_analyzer import (
+        _RE_BACKGROUND, _RE_REGISTRATION, _int_before)
+
+    analysis = parser.analysis
+    conversion = parser._conversion
+    plate_solve = parser._plate_solve
+    background = parser._background
+    registration = parser._registration
+    stacking = parser._stacking
+    timestamp = parser._timestamp
+    parse_timestamp = parser._parse_timestamp
+
+    cdef long solved = parser._solved_count
+    cdef long failed = parser._failed_count
+    cdef long count, total, channel
+    cdef double value, angle
+    cdef double fwhm_min = analysis.fwhm_min
+    cdef double fwhm_max = analysis.fwhm_max
+    cdef double fwhm_sum = analysis.fwhm_sum
+    cdef double rotation_min = analysis.rotation_min
+    cdef double rotation_max = analysis.rotation_max
+
+    fwhm_values = analysis.fwhm_values
+    rotation_angles = analysis.rotation_angles
+    re_line = parser._re_line
+
+    for line in lines:
+        # Same substring gates as the Python dispatch
+        if (b"solve" in line or b"FWHM" in line or b"Rotation:" in line
+                or b"Convert" in line or b"tack" in line or b"Pixel" in line
+                or b"Parallel" in line):
+            match = re_line.match(line)
+        else:
+            match = None
+        if match:
+            kind = match.lastgroup
+
+            if kind == "conv":
+                conversion.start_time = timestamp(line)
+                count = int(match.group("conv_n"))
+                conversion.image_count_in = count
+                conversion.image_count_out = count
+                if analysis.initial_images == 0:
+                    analysis.initial_images = count
+
+            elif kind == "convd":
+                conversion.end_time = timestamp(line)
+                conversion.image_count_out = int(match.group("convd_n"))
+
+            elif kind == "psok":
+                ts = timestamp(line)
+                if plate_solve.start_time is None:
+                    plate_solve.start_time = ts
+                plate_solve.end_time = ts
+                solved += 1
+
+            elif kind == "psfail":
+                ts = timestamp(line)
+                if plate_solve.start_time is None:
+                    plate_solve.start_time = ts
+                plate_solve.end_time = ts
+                failed += 1
+
+            elif kind == "pssum":
+                solved = int(match.group("pssum_ok"))
+                total = int(match.group("pssum_total"))
+                failed = total - solved
+                plate_solve.end_time = timestamp(line)
+
+            elif kind == "stackstart":
+                stacking.start_time = timestamp(line)
+
+            elif kind == "stackdone":
+                stacking.end_time = timestamp(line)
+                stacked = _int_before(line, b" images have been stacked")
+                if stacked is not None:
+                    parser._last_stacked_count = stacked
+                if parser._last_stacked_count is not None:
+                    stacking.image_count_out = parser._last_stacked_count
+                    analysis.final_images = parser._last_stacked_count
+
+            elif kind == "stacked":
+                parser._last_stacked_count = int(match.group("stacked_n"))
+
+            elif kind == "rej":
+                channel = int(match.group("rej_c"))
+                low = float(match.group("rej_lo"))
+                high = float(match.group("rej_hi"))
+                analysis.rejection_stats[channel] = (low, high)
+
+            elif kind == "procs":
+                analysis.processors_used = int(match.group("procs_n"))
+
+            elif kind == "fwhm":
+                value = float(match.group("fwhm_v"))
+                fwhm_values.append(value)
+                if value < fwhm_min:
+                    fwhm_min = value
+                if value > fwhm_max:
+                    fwhm_max = value
+                fwhm_sum += value
+
+            elif kind == "rot":
+                angle = float(match.group("rot_v"))
+                rotation_angles.append(angle)
+                if angle < rotation_min:
+                    rotation_min = angle
+                if angle > rotation_max:
+                    rotation_max = angle
+
+        if b"seqsubsky" in line or b"ackground extracted" in line:
+            if _RE_BACKGROUND.search(line):
+                if background.start_time is None:
+                    background.start_time = parse_timestamp(line)
+                background.end_time = parse_timestamp(line)
+
+        if b"seqapplyreg" in line or b"egistered" in line:
+            if _RE_REGISTRATION.search(line):
+                if registration.start_time is None:
+                    registration.start_time = parse_timestamp(line)
+                registration.end_time = parse_timestamp(line)
+
+    parser._solved_count = solved
+    parser._failed_count = failed
+    analysis.fwhm_min = fwhm_min
+    analysis.fwhm_max = fwhm_max
+    analysis.fwhm_sum = fwhm_sum
+    analysis.rotation_min = rotation_min
+    analysis.rotation_max = rotation_max
@@ -46,19 +46,150 @@ CHANGELOG:
 
 import re
 import sys
+import mmap
 import argparse
-from datetime import datetime, timedelta
+from array import array
 from typing import Dict, List, Tuple, Optional
 from dataclasses import dataclass, field
 
 
+# Pre-compiled patterns: the extractors below run these against every log
+# line, so compile once at module scope instead of paying re's cache lookup
+# on each call.
+# Optional compiled fast path for the numeric reductions. Numba pays off
+# when many logs (or very long sessions) are analyzed in one process; the
+# pure-Python running aggregates remain the fallback.
+try:
+    import numpy as np
+    from numba import njit
+
+    @njit(cache=True)
+    def _reduce_min_max_mean(values):
+        mn = values[0]
+        mx = values[0]
+        total = 0.0
+        for v in values:
+            if v < mn:
+                mn = v
+            if v > mx:
+                mx = v
+            total += v
+        return mn, mx, total / values.size
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Optional Cython-compiled scan loop (_siril_scan.pyx, built on the fly
+# by pyximport). Falls back to the pure-Python _scan_line loop when
+# Cython or a C compiler is unavailable.
+try:
+    import pyximport
+    pyximport.install(language_level=3)
+    from _siril_scan import scan_lines as _scan_lines_fast
+except Exception:
+    _scan_lines_fast = None
+
+# Optional Aho-Corasick keyword gate (pyahocorasick). One DFA pass over a
+# line decides whether any master-pattern keyword is present at all, so
+# the alternation regex only runs on lines that can match — the cost per
+# uninteresting line stays flat as the keyword set grows. pyahocorasick
+# automatons are unicode-only, so gated lines are decoded first; without
+# the package every line simply goes straight to the master regex. (The
+# Cython scan loop, when active, does not use this gate.)
+_MASTER_KEYWORDS = (
+    "Convert: processing",
+    "Converted ",
+    "platesolved and updated",
+    "did not solve",
+    "images successfully platesolved",
+    "Starting stacking",
+    "Stacked sequence successfully",
+    "Rejection stacking complete",
+    "images have been stacked",
+    "Pixel rejection in channel",
+    "Parallel processing enabled",
+    "FWHM ",
+    "Rotation:",
+)
+try:
+    import ahocorasick
+    _KEYWORD_AUTOMATON = ahocorasick.Automaton()
+    for _keyword in _MASTER_KEYWORDS:
+        _KEYWORD_AUTOMATON.add_word(_keyword, _keyword)
+    _KEYWORD_AUTOMATON.make_automaton()
+except ImportError:
+    _KEYWORD_AUTOMATON = None
+
+
+# Case varies in Siril output ("seqsubsky" vs "Background Extraction",
+# "Registered Sequence"), so match case-insensitively with compiled
+# patterns rather than lowercasing every line
+_RE_BACKGROUND = re.compile(rb'seqsubsky|background extracted', re.IGNORECASE)
+_RE_REGISTRATION = re.compile(rb'seqapplyreg|registered sequence', re.IGNORECASE)
+
+
+# Waterfall rendering constants: rows slice one prebuilt bar and share
+# one column template
+_BAR_WIDTH = 40
+_FULL_BAR = "█" * _BAR_WIDTH
+_ROW_TEMPLATE = "{:30s} {:4d} {}{}"
+
+
+def _int_before(line: bytes, literal: bytes) -> Optional[int]:
+    """Parse the integer immediately preceding literal in line, or None.
+
+    A find + digit walk is far cheaper than a regex for fixed-format
+    fields like "... 715 images have been stacked."
+    """
+    end = line.find(literal)
+    if end < 0:
+        return None
+    start = end
+    while start > 0 and 0x30 <= line[start - 1] <= 0x39:
+        start -= 1
+    if start == end:
+        return None
+    return int(line[start:end])
+
+# Master per-line pattern: one anchored alternation classifies a line and
+# captures its fields in a single regex call, instead of testing many
+# independent patterns against the same line. The branch that matched is
+# reported by Match.lastgroup. The waterfall-only report needs just the
+# image-count branches, so a reduced pattern without the quality-metric
+# branches (rejection, FWHM, rotation) is compiled alongside the full one.
+_LINE_COUNT_BRANCHES = (
+    rb'(?P<conv>Convert: processing (?P<conv_n>\d+) files)'
+    rb'|(?P<convd>Converted (?P<convd_n>\d+) .*files for processing)'
+    rb'|(?P<psok>.*platesolved and updated)'
+    rb'|(?P<psfail>.*did not solve)'
+    rb'|(?P<pssum>(?P<pssum_ok>\d+) images successfully platesolved out of (?P<pssum_total>\d+))'
+    rb'|(?P<stackstart>Starting stacking)'
+    rb'|(?P<stackdone>.*(?:Stacked sequence successfully|Rejection stacking complete))'
+    rb'|(?P<stacked>.*?(?P<stacked_n>\d+) images have been stacked)'
+)
+_LINE_METRIC_BRANCHES = (
+    rb'|(?P<rej>Pixel rejection in channel #(?P<rej_c>\d+):\s+(?P<rej_lo>[\d\.]+)%\s*-\s*(?P<rej_hi>[\d\.]+)%)'
+    rb'|(?P<procs>Parallel processing enabled.*using (?P<procs_n>\d+) logical processors)'
+    rb'|(?P<fwhm>.*FWHM (?P<fwhm_v>\d+\.\d+))'
+    rb'|(?P<rot>.*Rotation:\s+(?P<rot_v>[\+\-]?\d+\.\d+))'
+)
+_RE_LINE = re.compile(
+    rb'^(\d{2}:\d{2}:\d{2}):\s+(?:'
+    + _LINE_COUNT_BRANCHES + _LINE_METRIC_BRANCHES + rb')'
+)
+_RE_LINE_WATERFALL = re.compile(
+    rb'^(\d{2}:\d{2}:\d{2}):\s+(?:' + _LINE_COUNT_BRANCHES + rb')'
+)
+
+
 @dataclass
 class PhaseInfo:
     """Information about a processing phase"""
     name: str
-    start_time: Optional[datetime] = None
-    end_time: Optional[datetime] = None
-    duration: Optional[timedelta] = None
+    start_time: Optional[int] = None  # seconds since midnight
+    end_time: Optional[int] = None
+    duration: Optional[int] = None  # seconds
     image_count_in: Optional[int] = None
     image_count_out: Optional[int] = None
     failed: bool = False
@@ -68,15 +199,30 @@ class PhaseInfo:
 @dataclass
 class LogAnalysis:
     """Complete log analysis results"""
-    phases: List[PhaseInfo] = field(default_factory=list)
+    phases: Dict[str, PhaseInfo] = field(default_factory=dict)
     initial_images: int = 0
     final_images: int = 0
     plate_solve_failures: int = 0
     plate_solve_successes: int = 0
-    fwhm_values: List[float] = field(default_factory=list)
-    rotation_angles: List[float] = field(default_factory=list)
-    rejection_stats: Dict[str, float] = field(default_factory=dict)
+    # array('f') stores 4 bytes per value vs ~36 for a list of boxed
+    # floats; append and iteration work the same
+    fwhm_values: array = field(default_factory=lambda: array("f"))
+    rotation_angles: array = field(default_factory=lambda: array("f"))
+    # Running aggregates, updated as values stream in so reporting never
+    # has to re-scan the value lists
+    fwhm_min: float = float("inf")
+    fwhm_max: float = float("-inf")
+    fwhm_sum: float = 0.0
+    rotation_min: float = float("inf")
+    rotation_max: float = float("-inf")
+    rejection_stats: Dict[int, Tuple[float, float]] = field(default_factory=dict)
+    rejection_stats_str: Optional[str] = None
     processors_used: int = 0
+    # Derived ratios, computed once after parsing (None when the inputs
+    # needed to compute them are missing)
+    retention_pct: Optional[float] = None
+    plate_solve_success_pct: Optional[float] = None
+    plate_solve_failure_pct: Optional[float] = None
     patterns: List[str] = field(default_factory=list)
     errors: List[str] = field(default_factory=list)
     timestamp_gaps: List[Tuple[str, float]] = field(default_factory=list)
@@ -85,210 +231,287 @@ class LogAnalysis:
 class SirilLogParser:
     """Parser for Siril log files"""
     
-    def __init__(self, log_file_path: str):
+    def __init__(self, log_file_path: str, mode: str = "full"):
+        """mode="waterfall" skips the quality-metric collection (FWHM,
+        rotation, rejection stats) that only the full report prints"""
         self.log_file = log_file_path
         self.analysis = LogAnalysis()
-        self.log_lines = []
-        
+        self._re_line = _RE_LINE if mode == "full" else _RE_LINE_WATERFALL
+
     def parse(self) -> LogAnalysis:
-        """Main parsing method"""
+        """Main parsing method: a single streaming pass over the log"""
+        self._conversion = PhaseInfo(name="File Conversion")
+        self._plate_solve = PhaseInfo(name="Plate Solving")
+        self._background = PhaseInfo(name="Background Extraction")
+        self._registration = PhaseInfo(name="Registration")
+        self._stacking = PhaseInfo(name="Stacking")
+        self._solved_count = 0
+        self._failed_count = 0
+        # Stacked-image count, logged just before (or on) the
+        # stacking-complete message
+        self._last_stacked_count = None
+
         try:
-            with open(self.log_file, 'r', encoding='utf-8') as f:
-                self.log_lines = f.readlines()
+            with open(self.log_file, 'rb') as f:
+                try:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # Empty files cannot be mapped; nothing to scan
+                    mm = None
+                if mm is not None:
+                    with mm:
+                        lines = iter(mm.readline, b'')
+                        if _scan_lines_fast is not None:
+                            _scan_lines_fast(self, lines)
+                        else:
+                            self._scan_lines(lines)
         except Exception as e:
             self.analysis.errors.append(f"Failed to read log file: {e}")
             return self.analysis
-        
-        self._extract_initial_info()
-        self._extract_conversion_phase()
-        self._extract_plate_solve_phase()
-        self._extract_background_phase()
-        self._extract_registration_phase()
-        self._extract_stacking_phase()
+
+        self._finish_phases()
+        self._finalize()
         self._detect_patterns()
-        
+
         return self.analysis
-    
-    def _parse_timestamp(self, line: str) -> Optional[datetime]:
-        """Extract timestamp from log line"""
-        match = re.match(r'^(\d{2}:\d{2}:\d{2}):', line)
-        if match:
-            time_str = match.group(1)
-            try:
-                # Use a dummy date since logs don't include date
-                return datetime.strptime(f"2000-01-01 {time_str}", "%Y-%m-%d %H:%M:%S")
-            except:
-                pass
+
+    def _scan_lines(self, lines):
+        """Scan an iterable of bytes log lines, dispatching each to all
+        interested phase handlers.
+
+        One master regex call classifies a line and captures its fields;
+        the matched branch name selects the handler. Hot state is kept in
+        locals and written back after the loop.
+
+        Pure-Python fallback for _siril_scan.scan_lines — keep the two
+        dispatches in sync.
+        """
+        analysis = self.analysis
+        conversion = self._conversion
+        plate_solve = self._plate_solve
+        background = self._background
+        registration = self._registration
+        stacking = self._stacking
+        timestamp = self._timestamp
+        parse_timestamp = self._parse_timestamp
+        fwhm_values = analysis.fwhm_values
+        rotation_angles = analysis.rotation_angles
+        re_line_match = self._re_line.match
+        has_keyword = self._has_keyword if _KEYWORD_AUTOMATON is not None else None
+        solved = self._solved_count
+        failed = self._failed_count
+        last_stacked_count = self._last_stacked_count
+        fwhm_min = analysis.fwhm_min
+        fwhm_max = analysis.fwhm_max
+        fwhm_sum = analysis.fwhm_sum
+        rotation_min = analysis.rotation_min
+        rotation_max = analysis.rotation_max
+
+        for line in lines:
+            # Only run the master pattern when a cheap scan says the line
+            # can match at all: the automaton when available, otherwise a
+            # short or-chain of substring fragments (each a vectorized
+            # memmem) that together cover every master branch — keep them
+            # in sync.
+            if has_keyword is not None:
+                may_match = has_keyword(line)
+            else:
+                may_match = (b"solve" in line or b"FWHM" in line
+                             or b"Rotation:" in line or b"Convert" in line
+                             or b"tack" in line or b"Pixel" in line
+                             or b"Parallel" in line)
+            match = re_line_match(line) if may_match else None
+            if match:
+                kind = match.lastgroup
+
+                if kind == "conv":
+                    conversion.start_time = timestamp(line)
+                    count = int(match.group("conv_n"))
+                    conversion.image_count_in = count
+                    conversion.image_count_out = count
+                    if analysis.initial_images == 0:
+                        analysis.initial_images = count
+
+                elif kind == "convd":
+                    conversion.end_time = timestamp(line)
+                    conversion.image_count_out = int(match.group("convd_n"))
+
+                elif kind == "psok":
+                    ts = timestamp(line)
+                    if plate_solve.start_time is None:
+                        plate_solve.start_time = ts
+                    plate_solve.end_time = ts
+                    solved += 1
+
+                elif kind == "psfail":
+                    ts = timestamp(line)
+                    if plate_solve.start_time is None:
+                        plate_solve.start_time = ts
+                    plate_solve.end_time = ts
+                    failed += 1
+
+                elif kind == "pssum":
+                    solved = int(match.group("pssum_ok"))
+                    total = int(match.group("pssum_total"))
+                    failed = total - solved
+                    plate_solve.end_time = timestamp(line)
+
+                elif kind == "stackstart":
+                    stacking.start_time = timestamp(line)
+
+                elif kind == "stackdone":
+                    stacking.end_time = timestamp(line)
+
+                    # The count is logged on this line or shortly before it
+                    count = _int_before(line, b" images have been stacked")
+                    if count is not None:
+                        last_stacked_count = count
+                    if last_stacked_count is not None:
+                        stacking.image_count_out = last_stacked_count
+                        analysis.final_images = last_stacked_count
+
+                elif kind == "stacked":
+                    last_stacked_count = int(match.group("stacked_n"))
+
+                elif kind == "rej":
+                    channel = int(match.group("rej_c"))
+                    low = float(match.group("rej_lo"))
+                    high = float(match.group("rej_hi"))
+                    analysis.rejection_stats[channel] = (low, high)
+
+                elif kind == "procs":
+                    analysis.processors_used = int(match.group("procs_n"))
+
+                elif kind == "fwhm":
+                    value = float(match.group("fwhm_v"))
+                    fwhm_values.append(value)
+                    if value < fwhm_min:
+                        fwhm_min = value
+                    if value > fwhm_max:
+                        fwhm_max = value
+                    fwhm_sum += value
+
+                elif kind == "rot":
+                    angle = float(match.group("rot_v"))
+                    rotation_angles.append(angle)
+                    if angle < rotation_min:
+                        rotation_min = angle
+                    if angle > rotation_max:
+                        rotation_max = angle
+
+            # Substring gates cover the casings Siril actually emits
+            # (command names are lowercase, prose varies only in its
+            # leading letter); the case-insensitive patterns remain the
+            # deciders
+            if b"seqsubsky" in line or b"ackground extracted" in line:
+                if _RE_BACKGROUND.search(line):
+                    if background.start_time is None:
+                        background.start_time = parse_timestamp(line)
+                    background.end_time = parse_timestamp(line)
+
+            if b"seqapplyreg" in line or b"egistered" in line:
+                if _RE_REGISTRATION.search(line):
+                    if registration.start_time is None:
+                        registration.start_time = parse_timestamp(line)
+                    registration.end_time = parse_timestamp(line)
+
+        self._solved_count = solved
+        self._failed_count = failed
+        self._last_stacked_count = last_stacked_count
+        analysis.fwhm_min = fwhm_min
+        analysis.fwhm_max = fwhm_max
+        analysis.fwhm_sum = fwhm_sum
+        analysis.rotation_min = rotation_min
+        analysis.rotation_max = rotation_max
+
+    def _finish_phases(self):
+        """Close out phase bookkeeping once the whole log has been scanned"""
+        self.analysis.plate_solve_successes = self._solved_count
+        self.analysis.plate_solve_failures = self._failed_count
+        total_solved = self._solved_count + self._failed_count
+        self._plate_solve.image_count_in = total_solved if total_solved > 0 else None
+        self._plate_solve.image_count_out = self._solved_count if self._solved_count > 0 else None
+
+        for phase in (self._conversion, self._plate_solve, self._background,
+                      self._registration, self._stacking):
+            if phase.start_time is not None and phase.end_time is not None:
+                phase.duration = phase.end_time - phase.start_time
+                self.analysis.phases[phase.name] = phase
+
+    def _finalize(self):
+        """Compute derived ratios once so report methods don't repeat
+        the same divisions and zero-divisor guards"""
+        analysis = self.analysis
+        if analysis.initial_images > 0 and analysis.final_images > 0:
+            analysis.retention_pct = analysis.final_images / analysis.initial_images * 100
+
+        total = analysis.plate_solve_successes + analysis.plate_solve_failures
+        if total > 0:
+            analysis.plate_solve_success_pct = analysis.plate_solve_successes / total * 100
+            analysis.plate_solve_failure_pct = analysis.plate_solve_failures / total * 100
+
+        if analysis.rejection_stats:
+            analysis.rejection_stats_str = ", ".join(
+                f"{low:.3f}%-{high:.3f}%"
+                for low, high in analysis.rejection_stats.values())
+
+    def _has_keyword(self, line: bytes) -> bool:
+        """True if any master-pattern keyword occurs in the line"""
+        try:
+            text = line.decode("utf-8")
+        except UnicodeDecodeError:
+            # Let the master regex decide for undecodable lines
+            return True
+        return next(_KEYWORD_AUTOMATON.iter(text), None) is not None
+
+    def _parse_timestamp(self, line: bytes) -> Optional[int]:
+        """Extract timestamp from log line as seconds since midnight"""
+        # Logs always start lines with "HH:MM:SS:"; indexing a bytes
+        # object yields ints, so the format check and the digit
+        # conversion are pure integer arithmetic with no regex, int(),
+        # or slice allocations
+        if (len(line) >= 9 and line[2] == 0x3A and line[5] == 0x3A and line[8] == 0x3A
+                and 0x30 <= line[0] <= 0x39 and 0x30 <= line[1] <= 0x39
+                and 0x30 <= line[3] <= 0x39 and 0x30 <= line[4] <= 0x39
+                and 0x30 <= line[6] <= 0x39 and 0x30 <= line[7] <= 0x39):
+            return self._timestamp(line)
         return None
-    
-    def _extract_initial_info(self):
-        """Extract initial configuration info"""
-        for line in self.log_lines:
-            # Processor count
-            if "Parallel processing enabled" in line:
-                match = re.search(r'using (\d+) logical processors', line)
-                if match:
-                    self.analysis.processors_used = int(match.group(1))
-    
-    def _extract_conversion_phase(self):
-        """Extract conversion phase information"""
-        phase = PhaseInfo(name="File Conversion")
-        
-        for i, line in enumerate(self.log_lines):
-            if "Convert: processing" in line:
-                phase.start_time = self._parse_timestamp(line)
-                match = re.search(r'processing (\d+) files', line)
-                if match:
-                    count = int(match.group(1))
-                    phase.image_count_in = count
-                    phase.image_count_out = count
-                    if self.analysis.initial_images == 0:
-                        self.analysis.initial_images = count
-            
-            elif "Converted" in line and "files for processing" in line:
-                phase.end_time = self._parse_timestamp(line)
-                match = re.search(r'Converted (\d+)', line)
-                if match:
-                    phase.image_count_out = int(match.group(1))
-        
-        if phase.start_time and phase.end_time:
-            phase.duration = phase.end_time - phase.start_time
-            self.analysis.phases.append(phase)
-    
-    def _extract_plate_solve_phase(self):
-        """Extract plate solving phase information"""
-        phase = PhaseInfo(name="Plate Solving")
-        solved_count = 0
-        failed_count = 0
-        
-        for i, line in enumerate(self.log_lines):
-            if "platesolved and updated" in line:
-                if not phase.start_time:
-                    phase.start_time = self._parse_timestamp(line)
-                phase.end_time = self._parse_timestamp(line)
-                solved_count += 1
-            
-            elif "did not solve" in line:
-                if not phase.start_time:
-                    phase.start_time = self._parse_timestamp(line)
-                phase.end_time = self._parse_timestamp(line)
-                failed_count += 1
-            
-            # Summary line
-            elif "images successfully platesolved out of" in line:
-                match = re.search(r'(\d+) images successfully platesolved out of (\d+)', line)
-                if match:
-                    solved_count = int(match.group(1))
-                    total = int(match.group(2))
-                    failed_count = total - solved_count
-                phase.end_time = self._parse_timestamp(line)
-            
-            # Extract FWHM values
-            fwhm_match = re.search(r'FWHM (\d+\.\d+)', line)
-            if fwhm_match:
-                self.analysis.fwhm_values.append(float(fwhm_match.group(1)))
-            
-            # Extract rotation angles
-            rotation_match = re.search(r'Rotation:\s+([\+\-]?\d+\.\d+)', line)
-            if rotation_match:
-                self.analysis.rotation_angles.append(float(rotation_match.group(1)))
-        
-        self.analysis.plate_solve_successes = solved_count
-        self.analysis.plate_solve_failures = failed_count
-        phase.image_count_in = solved_count + failed_count if solved_count + failed_count > 0 else None
-        phase.image_count_out = solved_count if solved_count > 0 else None
-        
-        if phase.start_time and phase.end_time:
-            phase.duration = phase.end_time - phase.start_time
-            self.analysis.phases.append(phase)
-    
-    def _extract_background_phase(self):
-        """Extract background extraction phase"""
-        phase = PhaseInfo(name="Background Extraction")
-        
-        for line in self.log_lines:
-            if "seqsubsky" in line.lower() or "background extracted" in line.lower():
-                if not phase.start_time:
-                    phase.start_time = self._parse_timestamp(line)
-                phase.end_time = self._parse_timestamp(line)
-        
-        if phase.start_time and phase.end_time:
-            phase.duration = phase.end_time - phase.start_time
-            self.analysis.phases.append(phase)
-    
-    def _extract_registration_phase(self):
-        """Extract registration phase"""
-        phase = PhaseInfo(name="Registration")
-        
-        for line in self.log_lines:
-            if "seqapplyreg" in line.lower() or "registered sequence" in line.lower():
-                if not phase.start_time:
-                    phase.start_time = self._parse_timestamp(line)
-                phase.end_time = self._parse_timestamp(line)
-        
-        if phase.start_time and phase.end_time:
-            phase.duration = phase.end_time - phase.start_time
-            self.analysis.phases.append(phase)
-    
-    def _extract_stacking_phase(self):
-        """Extract stacking phase"""
-        phase = PhaseInfo(name="Stacking")
-        
-        for i, line in enumerate(self.log_lines):
-            if "Starting stacking" in line:
-                phase.start_time = self._parse_timestamp(line)
-            
-            elif "Stacked sequence successfully" in line or "Rejection stacking complete" in line:
-                phase.end_time = self._parse_timestamp(line)
-                
-                # Look for image count in nearby lines
-                for j in range(max(0, i-5), min(len(self.log_lines), i+1)):
-                    match = re.search(r'(\d+) images have been stacked', self.log_lines[j])
-                    if match:
-                        phase.image_count_out = int(match.group(1))
-                        self.analysis.final_images = int(match.group(1))
-                        break
-            
-            # Extract rejection statistics
-            elif "Pixel rejection in channel" in line:
-                match = re.search(r'channel #(\d+):\s+([\d\.]+)%\s*-\s*([\d\.]+)%', line)
-                if match:
-                    channel = int(match.group(1))
-                    low = float(match.group(2))
-                    high = float(match.group(3))
-                    self.analysis.rejection_stats[f"channel_{channel}"] = (low, high)
-        
-        if phase.start_time and phase.end_time:
-            phase.duration = phase.end_time - phase.start_time
-            self.analysis.phases.append(phase)
-    
+
+    def _timestamp(self, line: bytes) -> int:
+        """Convert a bytes line with an HH:MM:SS prefix to seconds since midnight"""
+        return ((line[0] - 0x30) * 36000 + (line[1] - 0x30) * 3600
+                + (line[3] - 0x30) * 600 + (line[4] - 0x30) * 60
+                + (line[6] - 0x30) * 10 + (line[7] - 0x30))
+
     def _detect_patterns(self):
         """Detect interesting patterns in the log"""
         patterns = []
         
         # Plate solving failures
         if self.analysis.plate_solve_failures > 0:
-            total = self.analysis.plate_solve_successes + self.analysis.plate_solve_failures
-            rate = (self.analysis.plate_solve_failures / total * 100) if total > 0 else 0
+            rate = self.analysis.plate_solve_failure_pct
             patterns.append(f"⚠ Plate Solving: {self.analysis.plate_solve_failures} images ({rate:.1f}%) failed to solve")
         
         # Overall retention rate
-        if self.analysis.initial_images > 0 and self.analysis.final_images > 0:
-            retention = (self.analysis.final_images / self.analysis.initial_images * 100)
+        if self.analysis.retention_pct is not None:
             lost = self.analysis.initial_images - self.analysis.final_images
-            patterns.append(f"ℹ Overall Retention: {retention:.1f}% ({lost} images filtered/rejected)")
+            patterns.append(f"ℹ Overall Retention: {self.analysis.retention_pct:.1f}% ({lost} images filtered/rejected)")
         
         # FWHM quality
         if self.analysis.fwhm_values:
-            fwhm_min = min(self.analysis.fwhm_values)
-            fwhm_max = max(self.analysis.fwhm_values)
-            fwhm_avg = sum(self.analysis.fwhm_values) / len(self.analysis.fwhm_values)
+            if NUMBA_AVAILABLE:
+                fwhm_min, fwhm_max, fwhm_avg = _reduce_min_max_mean(
+                    np.asarray(self.analysis.fwhm_values, dtype=np.float64))
+            else:
+                fwhm_min = self.analysis.fwhm_min
+                fwhm_max = self.analysis.fwhm_max
+                fwhm_avg = self.analysis.fwhm_sum / len(self.analysis.fwhm_values)
             patterns.append(f"ℹ FWHM Range: {fwhm_min:.1f} - {fwhm_max:.1f} pixels (avg: {fwhm_avg:.1f})")
         
         # Rotation angle drift (mosaic detection)
         if self.analysis.rotation_angles:
-            rot_min = min(self.analysis.rotation_angles)
-            rot_max = max(self.analysis.rotation_angles)
+            rot_min = self.analysis.rotation_min
+            rot_max = self.analysis.rotation_max
             if abs(rot_max - rot_min) > 10:
                 patterns.append(f"ℹ Mosaic Pattern: Rotation drift from {rot_min:.1f}° to {rot_max:.1f}° detected")
         
@@ -303,45 +526,46 @@ class SirilLogParser:
         self.analysis.patterns = patterns
     
     def _format_rejection_stats(self) -> str:
-        """Format rejection statistics"""
-        if not self.analysis.rejection_stats:
+        """Format rejection statistics (cached by _finalize)"""
+        if self.analysis.rejection_stats_str is None:
             return "N/A"
-        
-        ranges = []
-        for channel, (low, high) in self.analysis.rejection_stats.items():
-            ranges.append(f"{low:.3f}%-{high:.3f}%")
-        return ", ".join(ranges)
+        return self.analysis.rejection_stats_str
     
     def generate_waterfall(self) -> str:
         """Generate ASCII waterfall chart"""
-        lines = []
-        lines.append("=" * 60)
-        lines.append("IMAGE PROCESSING WATERFALL")
-        lines.append("=" * 60)
+        lines = [
+            "=" * 60,
+            "IMAGE PROCESSING WATERFALL",
+            "=" * 60,
+        ]
         
-        # Calculate bar width
+        # Hoist the bar scaling factor out of the per-row calls
         max_count = self.analysis.initial_images
-        bar_width = 40
+        scale = _BAR_WIDTH / max_count if max_count else 0.0
         
-        def make_bar(count: int, width: int = bar_width) -> str:
-            if max_count == 0:
+        def make_bar(count: int) -> str:
+            if not scale:
                 return ""
-            filled = int((count / max_count) * width)
+            filled = int(count * scale)
+            # Slice the prebuilt bar instead of re-multiplying; bars can
+            # exceed 100% (e.g. one raw frame converting to several), so
+            # fall back to multiplication past full width
+            if filled <= _BAR_WIDTH:
+                return _FULL_BAR[:filled]
             return "█" * filled
         
         def format_line(label: str, count: Optional[int], percentage: Optional[float] = None) -> str:
             if count is None:
                 return f"{label:30s} N/A"
-            bar = make_bar(count)
             pct_str = f" ({percentage:.0f}%)" if percentage is not None else ""
-            return f"{label:30s} {count:4d} {bar}{pct_str}"
+            return _ROW_TEMPLATE.format(label, count, make_bar(count), pct_str)
         
         # Initial
         lines.append(format_line("Initial Images", self.analysis.initial_images, 100))
         lines.append("  ↓")
         
         # Conversion
-        conv_phase = next((p for p in self.analysis.phases if "Conversion" in p.name), None)
+        conv_phase = self.analysis.phases.get("File Conversion")
         if conv_phase and conv_phase.image_count_out:
             pct = (conv_phase.image_count_out / self.analysis.initial_images * 100) if self.analysis.initial_images > 0 else 0
             lines.append(format_line("After Conversion", conv_phase.image_count_out, pct))
@@ -356,7 +580,7 @@ class SirilLogParser:
             lines.append("  ↓")
         
         # Registration (same as plate solve success for now)
-        reg_phase = next((p for p in self.analysis.phases if "Registration" in p.name), None)
+        reg_phase = self.analysis.phases.get("Registration")
         if reg_phase:
             count = reg_phase.image_count_out or self.analysis.plate_solve_successes
             pct = (count / self.analysis.initial_images * 100) if self.analysis.initial_images > 0 else 0
@@ -365,7 +589,7 @@ class SirilLogParser:
         
         # Final stacking
         if self.analysis.final_images > 0:
-            pct = (self.analysis.final_images / self.analysis.initial_images * 100) if self.analysis.initial_images > 0 else 0
+            pct = self.analysis.retention_pct if self.analysis.retention_pct is not None else 0
             lines.append(format_line("Final Stacked Images", self.analysis.final_images, pct))
             
             # Calculate rejected
@@ -380,28 +604,26 @@ class SirilLogParser:
     
     def generate_summary(self) -> str:
         """Generate complete summary report"""
-        lines = []
-        lines.append("")
-        lines.append("=" * 60)
-        lines.append("PROCESSING SUMMARY REPORT")
-        lines.append("=" * 60)
-        lines.append("")
-        
-        # [1] Execution Times
-        lines.append("[1] EXECUTION TIMES")
-        lines.append("-" * 30)
-        
-        total_duration = timedelta(0)
-        for phase in self.analysis.phases:
-            if phase.duration:
-                total_duration += phase.duration
-        
-        if total_duration.total_seconds() > 0:
+        lines = [
+            "",
+            "=" * 60,
+            "PROCESSING SUMMARY REPORT",
+            "=" * 60,
+            "",
+            "[1] EXECUTION TIMES",
+            "-" * 30,
+        ]
+        
+        total_duration = sum(
+            phase.duration for phase in self.analysis.phases.values()
+            if phase.duration)
+        
+        if total_duration > 0:
             lines.append(f"Total Duration:          {self._format_duration(total_duration)}")
             
-            for phase in self.analysis.phases:
+            for phase in self.analysis.phases.values():
                 if phase.duration:
-                    pct = (phase.duration.total_seconds() / total_duration.total_seconds() * 100)
+                    pct = (phase.duration / total_duration * 100)
                     lines.append(f"  • {phase.name:20s} {self._format_duration(phase.duration):>10s} ({pct:5.1f}%)")
         else:
             lines.append("Total Duration:          Unable to determine")
@@ -421,19 +643,14 @@ class SirilLogParser:
         lines.append(f"  • Initial Images:        {self.analysis.initial_images}")
         lines.append(f"  • Final Stacked Images:  {self.analysis.final_images}")
         
-        if self.analysis.initial_images > 0 and self.analysis.final_images > 0:
-            retention = (self.analysis.final_images / self.analysis.initial_images * 100)
-            lines.append(f"  • Overall Retention:     {retention:.1f}%")
+        if self.analysis.retention_pct is not None:
+            lines.append(f"  • Overall Retention:     {self.analysis.retention_pct:.1f}%")
         
         if self.analysis.plate_solve_successes > 0:
-            total = self.analysis.plate_solve_successes + self.analysis.plate_solve_failures
-            success_rate = (self.analysis.plate_solve_successes / total * 100)
-            lines.append(f"  • Plate Solve Success:   {success_rate:.1f}%")
+            lines.append(f"  • Plate Solve Success:   {self.analysis.plate_solve_success_pct:.1f}%")
         
         if self.analysis.fwhm_values:
-            fwhm_min = min(self.analysis.fwhm_values)
-            fwhm_max = max(self.analysis.fwhm_values)
-            lines.append(f"  • FWHM Range:            {fwhm_min:.1f} - {fwhm_max:.1f} pixels")
+            lines.append(f"  • FWHM Range:            {self.analysis.fwhm_min:.1f} - {self.analysis.fwhm_max:.1f} pixels")
         
         if self.analysis.rejection_stats:
             lines.append(f"  • Pixel Rejection:       {self._format_rejection_stats()}")
@@ -444,16 +661,13 @@ class SirilLogParser:
         if self.analysis.patterns:
             lines.append("[4] PATTERNS DETECTED")
             lines.append("-" * 30)
-            for pattern in self.analysis.patterns:
-                lines.append(f"  {pattern}")
+            lines.extend(f"  {pattern}" for pattern in self.analysis.patterns)
             lines.append("")
         
         # [5] Recommendations
         lines.append("[5] RECOMMENDATIONS")
         lines.append("-" * 30)
-        recommendations = self._generate_recommendations()
-        for rec in recommendations:
-            lines.append(f"  • {rec}")
+        lines.extend(f"  • {rec}" for rec in self._generate_recommendations())
         
         lines.append("")
         lines.append("=" * 60)
@@ -466,8 +680,7 @@ class SirilLogParser:
         
         # Plate solve success
         if self.analysis.plate_solve_successes > 0:
-            total = self.analysis.plate_solve_successes + self.analysis.plate_solve_failures
-            success_rate = (self.analysis.plate_solve_successes / total * 100)
+            success_rate = self.analysis.plate_solve_success_pct
             
             if success_rate >= 95:
                 recs.append(f"Plate solve success rate is excellent ({success_rate:.1f}%)")
@@ -477,8 +690,8 @@ class SirilLogParser:
                 recs.append(f"⚠ Low plate solve success rate ({success_rate:.1f}%) - check image quality")
         
         # Retention rate
-        if self.analysis.initial_images > 0 and self.analysis.final_images > 0:
-            retention = (self.analysis.final_images / self.analysis.initial_images * 100)
+        if self.analysis.retention_pct is not None:
+            retention = self.analysis.retention_pct
             loss = 100 - retention
             
             if retention >= 80:
@@ -489,8 +702,8 @@ class SirilLogParser:
                 recs.append(f"⚠ High image loss ({loss:.0f}%) - review quality filters and check for issues")
         
         # FWHM variation
-        if self.analysis.fwhm_values and len(self.analysis.fwhm_values) > 10:
-            fwhm_range = max(self.analysis.fwhm_values) - min(self.analysis.fwhm_values)
+        if len(self.analysis.fwhm_values) > 10:
+            fwhm_range = self.analysis.fwhm_max - self.analysis.fwhm_min
             if fwhm_range > 2.0:
                 recs.append("ℹ High FWHM variation detected - seeing conditions may have changed during session")
         
@@ -499,12 +712,10 @@ class SirilLogParser:
         
         return recs
     
-    def _format_duration(self, td: timedelta) -> str:
-        """Format timedelta as HH:MM:SS"""
-        total_seconds = int(td.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        seconds = total_seconds % 60
+    def _format_duration(self, total_seconds: int) -> str:
+        """Format a duration in seconds as HH:MM:SS"""
+        hours, rem = divmod(total_seconds, 3600)
+        minutes, seconds = divmod(rem, 60)
         return f"{hours:02d}:{minutes:02d}:{seconds:02d}"
     
     def save_report(self, output_path: str):
@@ -531,7 +742,8 @@ def main():
     args = parser.parse_args()
     
     # Parse log
-    analyzer = SirilLogParser(args.log_file)
+    mode = "waterfall" if args.waterfall_only else "full"
+    analyzer = SirilLogParser(args.log_file, mode=mode)
     analysis = analyzer.parse()
     
     # Display errors if any